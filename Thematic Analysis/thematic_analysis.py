@@ -1,21 +1,29 @@
+import os
+import sys
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from collections import Counter
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from review_schema import read_reviews_csv, write_reviews_csv, apply_review_schema, memory_usage_mb
+from instrumentation import span, traced
+
 # === Configuration ===
 INPUT_FILE = "./data/bank_reviews_with_sentiment.csv"
 OUTPUT_FILE = "./data/bank_reviews_with_sentiment_and_themes.csv"
 
 
+@traced()
 def load_data(path: str) -> pd.DataFrame:
     try:
-        df = pd.read_csv(path)
-        print(f"📄 Loaded {len(df)} reviews from {path}")
+        df = read_reviews_csv(path)
+        print(f"📄 Loaded {len(df)} reviews from {path} ({memory_usage_mb(df):.2f} MB)")
         return df
     except Exception as e:
         raise RuntimeError(f"❌ Error loading file: {e}")
 
 
+@traced(profile=True)
 def extract_keywords_tfidf(df: pd.DataFrame, max_features=1000, top_n=3) -> pd.DataFrame:
     #Add a 'keywords' column using top TF-IDF terms per review.
     print("🔍 Extracting keywords using TF-IDF...")
@@ -26,18 +34,20 @@ def extract_keywords_tfidf(df: pd.DataFrame, max_features=1000, top_n=3) -> pd.D
         max_features=max_features
     )
 
-    tfidf_matrix = tfidf.fit_transform(df['review'])
-    feature_names = tfidf.get_feature_names_out()
+    with span("tfidf_fit_transform", rows=len(df)):
+        tfidf_matrix = tfidf.fit_transform(df['review'])
+        feature_names = tfidf.get_feature_names_out()
 
     top_keywords = []
-    for row in tfidf_matrix:
-        row_array = row.toarray().flatten()
-        top_indices = row_array.argsort()[-top_n:][::-1]
-        keywords = [feature_names[i] for i in top_indices if row_array[i] > 0]
-        top_keywords.append(", ".join(keywords))
+    with span("top_terms", rows=len(df)):
+        for row in tfidf_matrix:
+            row_array = row.toarray().flatten()
+            top_indices = row_array.argsort()[-top_n:][::-1]
+            keywords = [feature_names[i] for i in top_indices if row_array[i] > 0]
+            top_keywords.append(", ".join(keywords))
 
     df['keywords'] = top_keywords
-    return df
+    return apply_review_schema(df)
 
 
 def map_to_theme(keywords: str) -> str:
@@ -64,19 +74,22 @@ def map_to_theme(keywords: str) -> str:
 
 
 
+@traced()
 def apply_theme_mapping(df: pd.DataFrame) -> pd.DataFrame:
     print("🧠 Mapping keywords to themes...")
     df['theme'] = df['keywords'].apply(map_to_theme)
-    return df
+    return apply_review_schema(df)
 
 
+@traced()
 def save_output(df: pd.DataFrame, path: str):
     try:
-        df.to_csv(path, index=False)
+        write_reviews_csv(df, path)
         print(f"✅ Saved themed data to: {path}")
     except Exception as e:
         raise RuntimeError(f"❌ Error saving output: {e}")
 
+@traced()
 def get_keyword_frequencies(df: pd.DataFrame, column: str = 'keywords', top_n: int = 50) -> pd.DataFrame:
     
     all_keywords = []
@@ -90,6 +103,7 @@ def get_keyword_frequencies(df: pd.DataFrame, column: str = 'keywords', top_n: i
 
     return pd.DataFrame(most_common, columns=["keyword", "count"])
 
+@traced("thematic_analysis")
 def main():
     df = load_data(INPUT_FILE)
     df = extract_keywords_tfidf(df)
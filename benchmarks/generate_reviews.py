@@ -0,0 +1,152 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from review_schema import apply_review_schema, write_reviews_csv
+
+# --- Vocabulary for synthetic reviews ---
+ENGLISH_WORDS = [
+    "app", "bank", "transfer", "money", "login", "password", "otp", "account", "balance",
+    "transaction", "slow", "fast", "easy", "good", "bad", "great", "crash", "update",
+    "error", "fail", "service", "customer", "support", "nice", "love", "worst", "best",
+    "design", "interface", "simple", "please", "fix", "working", "not", "open", "time",
+    "the", "is", "very", "it", "this", "and", "to", "my", "after", "every", "when",
+    "feature", "add", "option", "recommend", "helpful", "thanks", "really", "problem",
+    "freeze", "hang", "load", "send", "receive", "mobile", "banking", "telebirr", "airtime",
+]
+AMHARIC_WORDS = [
+    "ጥሩ", "አፕ", "ነው", "ባንክ", "በጣም", "አይሰራም", "ገንዘብ", "ማስተላለፍ", "አመሰግናለሁ", "ችግር",
+]
+OROMO_WORDS = [
+    "baay'ee", "gaarii", "appii", "baankii", "hin", "hojjetu", "maallaqa", "galatoomaa", "rakkoo",
+]
+EMOJIS = ["😀", "😡", "👍", "👎", "🙏", "🔥", "💯", "😢", "❤", "✅"]
+
+BANK_NAMES = ["Commercial Bank of Ethiopia", "Bank of Abyssinia", "Dashen Bank"]
+SENTIMENTS = ["positive", "negative", "neutral"]
+THEMES = [
+    "Account Access Issues", "Transaction Performance", "User Interface & Design",
+    "App Speed & Stability", "Customer Satisfaction", "Feature Requests", "Other",
+]
+
+
+def _bank_names(n_banks: int) -> list:
+    names = BANK_NAMES[:n_banks]
+    names += [f"Synthetic Bank {i + 1}" for i in range(len(names), n_banks)]
+    return names
+
+
+def _make_text(rng, length: int, vocab: list, emoji_density: float) -> str:
+    words = [vocab[i] for i in rng.integers(0, len(vocab), length)]
+    if emoji_density > 0:
+        for pos in np.flatnonzero(rng.random(length) < emoji_density):
+            words[pos] += EMOJIS[rng.integers(0, len(EMOJIS))]
+    return " ".join(words)
+
+
+def generate_reviews(
+    n_rows: int = 10_000,
+    n_banks: int = 3,
+    english_ratio: float = 0.85,
+    emoji_density: float = 0.05,
+    mean_words: float = 12,
+    max_words: int = 200,
+    duplicate_rate: float = 0.05,
+    enriched: bool = True,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    Builds a synthetic review corpus shaped like the scraper output.
+
+    Args:
+        n_rows: Total number of rows to generate.
+        n_banks: Number of distinct bank names.
+        english_ratio: Share of reviews written in English; the rest are Amharic or Afaan Oromo.
+        emoji_density: Probability that any word is followed by an emoji.
+        mean_words: Mean review length in words (lengths are log-normally distributed).
+        max_words: Upper bound on review length in words.
+        duplicate_rate: Share of rows that repeat an earlier (date, bank name, review).
+        enriched: Also add the sentiment, review_id, keywords and theme columns
+            produced by the later stages, so any stage can run on the output.
+        seed: Random seed, so the same arguments give the same corpus.
+
+    Returns:
+        A DataFrame in the shared review schema.
+    """
+    rng = np.random.default_rng(seed)
+    n_unique = max(1, int(round(n_rows * (1 - duplicate_rate))))
+
+    lengths = np.clip(rng.lognormal(np.log(mean_words), 0.6, n_unique).astype(int), 1, max_words)
+    languages = rng.choice(3, n_unique, p=[english_ratio, (1 - english_ratio) / 2, (1 - english_ratio) / 2])
+    vocabularies = [ENGLISH_WORDS, AMHARIC_WORDS, OROMO_WORDS]
+    texts = [_make_text(rng, length, vocabularies[lang], emoji_density) for length, lang in zip(lengths, languages)]
+
+    banks = _bank_names(n_banks)
+    dates = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 900, n_unique), unit="D")
+    df = pd.DataFrame({
+        "date": dates,
+        "bank name": pd.Categorical.from_codes(rng.integers(0, n_banks, n_unique), banks),
+        "review": texts,
+        "rating": rng.integers(1, 6, n_unique),
+        "source": "Google Play",
+    })
+
+    # Duplicates are exact copies of rows already in the corpus
+    if n_rows > n_unique:
+        duplicates = df.iloc[rng.integers(0, n_unique, n_rows - n_unique)]
+        df = pd.concat([df, duplicates], ignore_index=True)
+        df = df.iloc[rng.permutation(n_rows)].reset_index(drop=True)
+
+    if enriched:
+        df["sentiment_label"] = pd.Categorical.from_codes(rng.integers(0, 3, n_rows), SENTIMENTS)
+        df["sentiment_score"] = rng.random(n_rows).round(4)
+        df["review_id"] = [f"rev_{i + 1:05d}" for i in range(n_rows)]
+        keyword_idx = rng.integers(0, len(ENGLISH_WORDS), (n_rows, 3))
+        df["keywords"] = [", ".join(ENGLISH_WORDS[i] for i in row) for row in keyword_idx]
+        df["theme"] = pd.Categorical.from_codes(rng.integers(0, len(THEMES), n_rows), THEMES)
+
+    return apply_review_schema(df)
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--banks", type=int, default=3)
+    parser.add_argument("--english-ratio", type=float, default=0.85)
+    parser.add_argument("--emoji-density", type=float, default=0.05)
+    parser.add_argument("--mean-words", type=float, default=12)
+    parser.add_argument("--max-words", type=int, default=200)
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def generator_kwargs(args: argparse.Namespace) -> dict:
+    return {
+        "n_banks": args.banks,
+        "english_ratio": args.english_ratio,
+        "emoji_density": args.emoji_density,
+        "mean_words": args.mean_words,
+        "max_words": args.max_words,
+        "duplicate_rate": args.duplicate_rate,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic bank review corpus.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    add_generator_arguments(parser)
+    parser.add_argument("--raw", action="store_true", help="Only the scraper columns, no sentiment/theme columns")
+    parser.add_argument("--output", default="./data/synthetic_reviews.csv")
+    args = parser.parse_args()
+
+    df = generate_reviews(n_rows=args.rows, enriched=not args.raw, **generator_kwargs(args))
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    write_reviews_csv(df, args.output)
+    print(f"✅ Generated {len(df)} synthetic reviews → {args.output}")
+
+
+if __name__ == "__main__":
+    print("🧪 Generating synthetic reviews...")
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# The benchmark records its own numbers; pipeline span metrics are opt-in here
+os.environ.setdefault("PIPELINE_METRICS_FILE", "off")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from generate_reviews import ENGLISH_WORDS, AMHARIC_WORDS, OROMO_WORDS, add_generator_arguments, generator_kwargs, generate_reviews
+from instrumentation import PeakRSS
+
+RESULTS_FILE = os.path.join(ROOT, "benchmarks", "results.jsonl")
+REGRESSION_TOLERANCE = 0.10  # Flag stages whose throughput drops, or memory growth rises, by more than this
+RSS_NOISE_MB = 5.0  # Memory growth changes smaller than this are sampling noise, not regressions
+
+
+def load_script(name: str, relative_path: str):
+    # Pipeline scripts live in folders with spaces in their names, so load them by path
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Stand-ins for external resources ---
+class StandInCursor:
+    """
+    In-memory replacement for the Oracle cursor used by database_script.py.
+
+    Understands exactly the statements the loader issues and counts every
+    execute() call as one round trip.
+    """
+
+    def __init__(self):
+        self.banks = {}
+        self.reviews = {}
+        self.round_trips = 0
+        self._result = None
+
+    def execute(self, sql, params=None):
+        self.round_trips += 1
+        sql = " ".join(sql.split())
+        if sql.startswith("SELECT COUNT(*) FROM banks"):
+            self._result = (int(params[0] in self.banks),)
+        elif sql.startswith("INSERT INTO banks"):
+            self.banks[params[0]] = len(self.banks) + 1
+        elif sql.startswith("SELECT id FROM banks"):
+            self._result = (self.banks[params[0]],)
+        elif sql.startswith("SELECT COUNT(*) FROM reviews"):
+            self._result = (int(params[0] in self.reviews),)
+        elif sql.startswith("INSERT INTO reviews"):
+            self.reviews[params['rid']] = params
+        else:
+            raise ValueError(f"Unsupported statement for stand-in cursor: {sql[:60]}")
+
+    def fetchone(self):
+        return self._result
+
+
+def build_tiny_model():
+    #A randomly initialised one-layer DistilBERT with a vocabulary built from the generator's words
+    from transformers import BertTokenizerFast, DistilBertConfig, DistilBertForSequenceClassification
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(set(ENGLISH_WORDS + AMHARIC_WORDS + OROMO_WORDS))
+    vocab_dir = tempfile.mkdtemp(prefix="tiny_model_")
+    vocab_file = os.path.join(vocab_dir, "vocab.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file)
+    config = DistilBertConfig(vocab_size=len(vocab), dim=32, n_layers=1, n_heads=2, hidden_dim=64, num_labels=2)
+    model = DistilBertForSequenceClassification(config)
+    return tokenizer, model
+
+
+# --- Measurement ---
+def measure(run, rows: int) -> dict:
+    # peak_rss_mb is the whole process, so it includes whatever earlier stages in
+    # the same run left loaded (e.g. torch after predict_sentiment_batch) and
+    # depends on --stages order. peak_rss_delta_mb is the growth during this
+    # stage only, and is the memory figure compared against the baseline.
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        output = run()
+        seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": round(rss.peak_rss / 1024 ** 2, 1),
+        "peak_rss_delta_mb": round((rss.peak_rss - rss.start_rss) / 1024 ** 2, 1),
+        # Stages may report extra counters (e.g. DB round trips) by returning a dict
+        **(output if isinstance(output, dict) else {}),
+    }
+
+
+# --- Stages ---
+# Each stage takes the generated corpus, prepares its inputs outside the timed
+# region and returns the callable to time. Stage functions are timed without
+# their @traced wrapper so instrumentation overhead stays out of the results.
+def stage_clean_reviews(df):
+    data_cleaner = load_script("data_cleaner", "scraper app/data_cleaner.py")
+    raw = df[["date", "bank name", "review", "rating", "source"]].copy()
+    return lambda: inspect.unwrap(data_cleaner.clean_reviews)(raw)
+
+
+def stage_remove_non_english_reviews(df):
+    data_cleaner = load_script("data_cleaner", "scraper app/data_cleaner.py")
+    raw = df[["date", "bank name", "review", "rating", "source"]].copy()
+    return lambda: inspect.unwrap(data_cleaner.remove_non_english_reviews)(raw)
+
+
+def stage_predict_sentiment_batch(df):
+    sentiment = load_script("sentiment_analysis", "sentiment analysis/sentiment_analysis.py")
+    tokenizer, model = build_tiny_model()
+    model.to(sentiment.DEVICE)
+    texts = df["review"].astype(str).tolist()
+    return lambda: inspect.unwrap(sentiment.predict_sentiment_batch)(texts, tokenizer, model)
+
+
+def stage_extract_keywords_tfidf(df):
+    thematic = load_script("thematic_analysis", "Thematic Analysis/thematic_analysis.py")
+    reviews = df[["review"]].copy()
+    return lambda: inspect.unwrap(thematic.extract_keywords_tfidf)(reviews)
+
+
+def stage_map_to_theme(df):
+    thematic = load_script("thematic_analysis", "Thematic Analysis/thematic_analysis.py")
+    keywords = df["keywords"].copy()
+    return lambda: keywords.apply(thematic.map_to_theme)
+
+
+def stage_get_most_common_words(df):
+    insight = load_script("insight_analysis", "insight script/insight_analysis.py")
+    reviews = df["review"].copy()
+    return lambda: inspect.unwrap(insight.get_most_common_words)(reviews)
+
+
+def stage_db_loader(df):
+    database = load_script("database_script", "database/database_script.py")
+    cursor = StandInCursor()
+
+    ensure_banks = inspect.unwrap(database.ensure_banks)
+    insert_reviews = inspect.unwrap(database.insert_reviews)
+
+    def run():
+        ensure_banks(cursor, df)
+        insert_reviews(cursor, df)
+        # insert_reviews prints and skips failed rows, which would otherwise show up as a fast run
+        if len(cursor.reviews) != len(df):
+            raise RuntimeError(f"❌ Stand-in DB received {len(cursor.reviews)} of {len(df)} reviews; not recording this run")
+        return {"round_trips": cursor.round_trips}
+
+    return run
+
+
+STAGES = {
+    "clean_reviews": stage_clean_reviews,
+    "remove_non_english_reviews": stage_remove_non_english_reviews,
+    "predict_sentiment_batch": stage_predict_sentiment_batch,
+    "extract_keywords_tfidf": stage_extract_keywords_tfidf,
+    "map_to_theme": stage_map_to_theme,
+    "get_most_common_words": stage_get_most_common_words,
+    "db_loader": stage_db_loader,
+}
+
+
+# --- Results ---
+def save_results(records: list, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    print(f"✅ {len(records)} results appended to: {path}")
+
+
+def baseline_key(record: dict) -> tuple:
+    # Runs are only comparable for the same stage, size and generator settings
+    return record["stage"], record["rows"], json.dumps(record.get("generator"), sort_keys=True)
+
+
+def load_baseline(baseline_path: str) -> dict:
+    #Latest baseline record per (stage, rows, generator settings)
+    baseline = {}
+    with open(baseline_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                baseline[baseline_key(record)] = record
+    return baseline
+
+
+def compare_to_baseline(records: list, baseline: dict, tolerance: float = REGRESSION_TOLERANCE) -> list:
+    #Compare throughput and per-stage memory growth against the matching baseline record
+    regressions = []
+    for record in records:
+        label = f"{record['stage']:<28} {record['rows']:>10} rows"
+        previous = baseline.get(baseline_key(record))
+        if not previous:
+            print(f"  {label}  no baseline with the same generator settings")
+            continue
+
+        regressed = False
+        if previous.get("rows_per_sec") and record.get("rows_per_sec"):
+            ratio = record["rows_per_sec"] / previous["rows_per_sec"]
+            slower = ratio < 1 - tolerance
+            print(f"{'⚠️ ' if slower else '  '}{label}  {ratio:6.2f}x throughput vs baseline")
+            regressed |= slower
+
+        if previous.get("peak_rss_delta_mb") is not None and record.get("peak_rss_delta_mb") is not None:
+            before, after = previous["peak_rss_delta_mb"], record["peak_rss_delta_mb"]
+            grew = after > before * (1 + tolerance) and after - before > RSS_NOISE_MB
+            print(f"{'⚠️ ' if grew else '  '}{label}  memory growth {before} → {after} MB")
+            regressed |= grew
+
+        if regressed:
+            regressions.append(record)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on synthetic reviews.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    add_generator_arguments(parser)
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", help="Results file to compare throughput and memory growth against")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args()
+
+    # Read the baseline before this run appends to it, in case it is the output file
+    baseline = load_baseline(args.baseline) if args.baseline else None
+
+    run_info = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "generator": generator_kwargs(args),
+    }
+
+    records = []
+    for size in args.sizes:
+        print(f"\n🧪 Generating {size} synthetic reviews...")
+        df = generate_reviews(n_rows=size, **generator_kwargs(args))
+        for stage in args.stages:
+            print(f"⏱️  {stage} ({size} rows)")
+            result = measure(STAGES[stage](df), len(df))
+            print(f"   {result['seconds']}s, {result['rows_per_sec']} rows/s, peak RSS {result['peak_rss_mb']} MB")
+            records.append({"stage": stage, **result, **run_info})
+
+    regressions = []
+    if baseline is not None:
+        print(f"\n📊 Comparing against baseline: {args.baseline}")
+        regressions = compare_to_baseline(records, baseline, args.tolerance)
+
+    save_results(records, args.output)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    print("🚀 Starting pipeline benchmarks...")
+    main()
@@ -1,6 +1,11 @@
 import pandas as pd
 import oracledb
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from review_schema import read_reviews_csv, memory_usage_mb
+from instrumentation import CountingCursor, count, span, traced
 
 # === CONFIG ===
 CSV_FILE = './data/bank_reviews_with_sentiment_and_themes.csv'
@@ -8,6 +13,7 @@ ORACLE_DSN = oracledb.makedsn("localhost", 1521, service_name="XEPDB1")
 USERNAME = "SYS"
 PASSWORD = "aeiou"
 
+@traced()
 def connect_to_oracle():
     try:
         conn = oracledb.connect(user=USERNAME, password=PASSWORD, dsn=ORACLE_DSN, mode=oracledb.SYSDBA)
@@ -42,6 +48,7 @@ def create_tables(cursor):
     print("✅ Tables created (if not exist)")
 
 
+@traced()
 def ensure_banks(cursor, df):
     bank_names = df['bank name'].unique()
     for name in bank_names:
@@ -57,6 +64,7 @@ def get_bank_id(cursor, name):
     return cursor.fetchone()[0]
 
 
+@traced(profile=True)
 def insert_reviews(cursor, df):
     inserted = 0
     for _, row in df.iterrows():
@@ -71,18 +79,18 @@ def insert_reviews(cursor, df):
                     source, sentiment_label, sentiment_score, theme, keywords
                 )
                 VALUES (
-                    :rid, :bid, :txt, :rat, TO_DATE(:rdate, 'YYYY-MM-DD'),
+                    :rid, :bid, :txt, :rat, :rdate,
                     :src, :sent, :sscore, :thm, :kw
                 )
             """, {
                 'rid': row['review_id'],
                 'bid': bank_id,
                 'txt': row['review'],
-                'rat': row['rating'],
-                'rdate': row['date'],
+                'rat': int(row['rating']) if pd.notnull(row['rating']) else None,
+                'rdate': row['date'].to_pydatetime() if pd.notnull(row['date']) else None,
                 'src': row['source'],
                 'sent': row['sentiment_label'],
-                'sscore': row['sentiment_score'],
+                'sscore': float(row['sentiment_score']) if pd.notnull(row['sentiment_score']) else None,
                 'thm': row['theme'],
                 'kw': row['keywords'] if pd.notnull(row['keywords']) and row['keywords'].strip() != '' else None
                 })
@@ -92,10 +100,14 @@ def insert_reviews(cursor, df):
     print(f"✅ Inserted {inserted} new reviews")
 
 
+@traced("database_load")
 def main():
-    df = pd.read_csv(CSV_FILE)
+    with span("load_csv") as step:
+        df = read_reviews_csv(CSV_FILE)
+        step.rows = len(df)
+    print(f"📄 Loaded {len(df)} reviews ({memory_usage_mb(df):.2f} MB)")
     conn = connect_to_oracle()
-    cursor = conn.cursor()
+    cursor = CountingCursor(conn.cursor())
 
     try:
         try:
@@ -106,7 +118,9 @@ def main():
         ensure_banks(cursor, df)
         insert_reviews(cursor, df)
 
-        conn.commit()
+        with span("commit"):
+            conn.commit()
+            count("db_round_trips")
     finally:
         cursor.close()
         conn.close()
@@ -3,8 +3,15 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
 import re
+import os
+import sys
+import time
 import oracledb
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from review_schema import DB_REVIEW_DTYPES, apply_review_schema
+from instrumentation import CountingCursor, count, span, traced
+
 # --- Database Connection ---
 # IMPORTANT: Replace with your actual database credentials and connection string.
 # Example DSN format: "your_hostname:your_port/your_service_name"
@@ -12,68 +19,85 @@ db_user = "SYS"
 db_password = "aeiou"
 db_dsn = oracledb.makedsn("localhost", 1521, service_name="XEPDB1")
 
-connection = None # Initialize connection to None
-try:
-    # Establish the connection to the Oracle database
-    connection = oracledb.connect(user=db_user, password=db_password, dsn=db_dsn, mode=oracledb.SYSDBA)
-    print("Successfully connected to Oracle Database!")
-
-    # --- Load Banks Data (can use pandas directly) ---
-    banks_query = "SELECT ID, NAME FROM BANKS"
-    banks_df = pd.read_sql_query(banks_query, connection)
 
-    # --- Load Reviews Data with Explicit LOB Handling ---
-    reviews_data_list = [] # To store lists of row data
-    cursor = connection.cursor() # Create a cursor to fetch reviews
-    reviews_query_sql = "SELECT ID, BANK_ID, REVIEW_TEXT, RATING, SENTIMENT_LABEL FROM REVIEWS"
-    cursor.execute(reviews_query_sql)
-
-    # Define column names for clarity for the DataFrame
-    reviews_columns = ['ID', 'BANK_ID', 'REVIEW_TEXT', 'RATING', 'SENTIMENT_LABEL']
+@traced()
+def load_from_db():
+    """
+    Loads the banks and reviews tables, reading CLOB review text into strings.
 
-    for row in cursor:
-        row_list = list(row) # Convert tuple to list to modify
+    Returns:
+        A tuple of (banks_df, reviews_df).
+    """
+    connection = None # Initialize connection to None
+    try:
+        # Establish the connection to the Oracle database
+        with span("connect"):
+            connection = oracledb.connect(user=db_user, password=db_password, dsn=db_dsn, mode=oracledb.SYSDBA)
+        print("Successfully connected to Oracle Database!")
+
+        # --- Load Banks Data (can use pandas directly) ---
+        banks_query = "SELECT ID, NAME FROM BANKS"
+        with span("read_banks") as step:
+            banks_df = pd.read_sql_query(banks_query, connection)
+            count("db_round_trips")
+            step.rows = len(banks_df)
+
+        # --- Load Reviews Data with Explicit LOB Handling ---
+        reviews_data_list = [] # To store lists of row data
+        cursor = CountingCursor(connection.cursor()) # Create a cursor to fetch reviews
+        reviews_query_sql = "SELECT ID, BANK_ID, REVIEW_TEXT, RATING, SENTIMENT_LABEL FROM REVIEWS"
+        with span("fetch_reviews") as step:
+            cursor.execute(reviews_query_sql)
+
+            # Define column names for clarity for the DataFrame
+            reviews_columns = ['ID', 'BANK_ID', 'REVIEW_TEXT', 'RATING', 'SENTIMENT_LABEL']
+
+            for row in cursor:
+                row_list = list(row) # Convert tuple to list to modify
         
-        # Check if the REVIEW_TEXT (at index 2) is an oracledb.LOB object
-        if isinstance(row_list[2], oracledb.LOB):
-            try:
-                # Read the CLOB content into a Python string
-                row_list[2] = row_list[2].read()
-            except oracledb.Error as e:
-                error_obj, = e.args
-                print(f"Warning: Could not read LOB for review ID {row_list[0]}. Error: {error_obj.message}")
-                row_list[2] = None # Set to None if reading fails
-        # Handle cases where it might already be None or a string (though unlikely for CLOB from raw fetch)
-        elif row_list[2] is None:
-            row_list[2] = None # Explicitly keep as None
-        # If it's already a string, it remains as is
-
-        reviews_data_list.append(row_list)
-
-    reviews_df = pd.DataFrame(reviews_data_list, columns=reviews_columns)
-    cursor.close() # Close cursor after fetching all data
-
-except Exception as e:
-    print("Error connecting to the database or fetching data:", e)
-    # Exit the script if the database connection fails
-    exit()
-
-finally:
-    # Always close the connection when you're done
-    if connection and connection.is_healthy(): # Check if connection object exists and is healthy before closing
-        connection.close()
-        print("Database connection closed.")
+                # Check if the REVIEW_TEXT (at index 2) is an oracledb.LOB object
+                if isinstance(row_list[2], oracledb.LOB):
+                    try:
+                        # Read the CLOB content into a Python string (one round trip per LOB)
+                        lob_start = time.perf_counter()
+                        row_list[2] = row_list[2].read()
+                        step.add_time('lob_read_s', time.perf_counter() - lob_start)
+                        count("lob_reads")
+                        count("db_round_trips")
+                    except oracledb.Error as e:
+                        error_obj, = e.args
+                        print(f"Warning: Could not read LOB for review ID {row_list[0]}. Error: {error_obj.message}")
+                        row_list[2] = None # Set to None if reading fails
+                # Handle cases where it might already be None or a string (though unlikely for CLOB from raw fetch)
+                elif row_list[2] is None:
+                    row_list[2] = None # Explicitly keep as None
+                # If it's already a string, it remains as is
+
+                reviews_data_list.append(row_list)
+
+            step.rows = len(reviews_data_list)
+            reviews_df = apply_review_schema(pd.DataFrame(reviews_data_list, columns=reviews_columns), DB_REVIEW_DTYPES)
+        cursor.close() # Close cursor after fetching all data
+
+    except Exception as e:
+        print("Error connecting to the database or fetching data:", e)
+        # Exit the script if the database connection fails
+        exit()
+
+    finally:
+        # Always close the connection when you're done
+        if connection and connection.is_healthy(): # Check if connection object exists and is healthy before closing
+            connection.close()
+            print("Database connection closed.")
+
+    return banks_df, reviews_df
 
 
 # --- Rest of your code (Data Preparation, Text Preprocessing, Visualizations) ---
 
-# Data Preparation and Merging
-df = pd.merge(reviews_df, banks_df, left_on='BANK_ID', right_on='ID')
-df.rename(columns={'NAME': 'BANK_NAME'}, inplace=True)
-
-
 # Text Preprocessing for Word Frequency Analysis (Your function as provided previously)
 # ... (your get_most_common_words function goes here, as it was corrected)
+@traced(profile=True)
 def get_most_common_words(review_series, num_words=15):
     """
     Analyzes a pandas Series of reviews, handles Oracle LOBs, and returns the most common words.
@@ -109,8 +133,8 @@ def get_most_common_words(review_series, num_words=15):
                         clean_texts.append(decoded_text)
                 except UnicodeDecodeError:
                     print(f"Warning: Could not decode bytes for a review. Skipping.")
-            # Handle pandas NaN or None values
-            elif review is None or (isinstance(review, float) and pd.isna(review)):
+            # Handle pandas NaN, NA (from Arrow-backed strings) or None values
+            elif pd.isna(review):
                 continue # Skip None/NaN values
             else:
                 # Catch any other unexpected types
@@ -163,61 +187,73 @@ def get_most_common_words(review_series, num_words=15):
     return word_counts.most_common(num_words)
 
 
-# Get most common words for positive and negative reviews
-positive_reviews_texts = df[df['SENTIMENT_LABEL'] == 'positive']['REVIEW_TEXT']
-negative_reviews_texts = df[df['SENTIMENT_LABEL'] == 'negative']['REVIEW_TEXT']
-
-# These calls should now receive pandas Series of strings, not LOB objects
-most_common_positive = get_most_common_words(positive_reviews_texts)
-most_common_negative = get_most_common_words(negative_reviews_texts)
-
-# Convert to DataFrames for plotting
-positive_words_df = pd.DataFrame(most_common_positive, columns=['word', 'count'])
-negative_words_df = pd.DataFrame(most_common_negative, columns=['word', 'count'])
-
-
-# --- Visualizations (The rest of the script remains the same) ---
-
-# 1. Rating Distribution per Bank
-plt.figure(figsize=(10, 6))
-sns.countplot(data=df, x='RATING', hue='BANK_NAME', palette='viridis')
-plt.title('Distribution of Ratings per Bank')
-plt.xlabel('Rating')
-plt.ylabel('Number of Reviews')
-plt.legend(title='Bank')
-plt.tight_layout()
-plt.savefig('rating_distribution_from_db.png')
-plt.show()
-
-# 2. Sentiment Distribution per Bank
-plt.figure(figsize=(10, 6))
-sns.countplot(data=df, x='SENTIMENT_LABEL', hue='BANK_NAME', order=['positive', 'negative', 'neutral'], palette='magma')
-plt.title('Distribution of Sentiments per Bank')
-plt.xlabel('Sentiment')
-plt.ylabel('Number of Reviews')
-plt.legend(title='Bank')
-plt.tight_layout()
-plt.savefig('sentiment_distribution_from_db.png')
-plt.show()
-
-# 3. Most Common Words in Positive Reviews (Drivers)
-plt.figure(figsize=(12, 7))
-sns.barplot(data=positive_words_df, x='count', y='word', palette='Greens_r')
-plt.title('Most Common Words in Positive Reviews (Drivers)')
-plt.xlabel('Frequency')
-plt.ylabel('Words')
-plt.tight_layout()
-plt.savefig('positive_words_barchart_from_db.png')
-plt.show()
-
-# 4. Most Common Words in Negative Reviews (Pain Points)
-plt.figure(figsize=(12, 7))
-sns.barplot(data=negative_words_df, x='count', y='word', palette='Reds_r')
-plt.title('Most Common Words in Negative Reviews (Pain Points)')
-plt.xlabel('Frequency')
-plt.ylabel('Words')
-plt.tight_layout()
-plt.savefig('negative_words_barchart_from_db.png')
-plt.show()
-
-print("\nAnalysis complete. All visualizations have been saved with the '_from_db' suffix.")
\ No newline at end of file
+@traced("insight_analysis")
+def main():
+    banks_df, reviews_df = load_from_db()
+
+    # Data Preparation and Merging
+    df = pd.merge(reviews_df, banks_df, left_on='BANK_ID', right_on='ID')
+    df.rename(columns={'NAME': 'BANK_NAME'}, inplace=True)
+
+    # Get most common words for positive and negative reviews
+    positive_reviews_texts = df[df['SENTIMENT_LABEL'] == 'positive']['REVIEW_TEXT']
+    negative_reviews_texts = df[df['SENTIMENT_LABEL'] == 'negative']['REVIEW_TEXT']
+
+    # These calls should now receive pandas Series of strings, not LOB objects
+    most_common_positive = get_most_common_words(positive_reviews_texts)
+    most_common_negative = get_most_common_words(negative_reviews_texts)
+
+    # Convert to DataFrames for plotting
+    positive_words_df = pd.DataFrame(most_common_positive, columns=['word', 'count'])
+    negative_words_df = pd.DataFrame(most_common_negative, columns=['word', 'count'])
+
+
+    # --- Visualizations (The rest of the script remains the same) ---
+
+    # 1. Rating Distribution per Bank
+    plt.figure(figsize=(10, 6))
+    sns.countplot(data=df, x='RATING', hue='BANK_NAME', palette='viridis')
+    plt.title('Distribution of Ratings per Bank')
+    plt.xlabel('Rating')
+    plt.ylabel('Number of Reviews')
+    plt.legend(title='Bank')
+    plt.tight_layout()
+    plt.savefig('rating_distribution_from_db.png')
+    plt.show()
+
+    # 2. Sentiment Distribution per Bank
+    plt.figure(figsize=(10, 6))
+    sns.countplot(data=df, x='SENTIMENT_LABEL', hue='BANK_NAME', order=['positive', 'negative', 'neutral'], palette='magma')
+    plt.title('Distribution of Sentiments per Bank')
+    plt.xlabel('Sentiment')
+    plt.ylabel('Number of Reviews')
+    plt.legend(title='Bank')
+    plt.tight_layout()
+    plt.savefig('sentiment_distribution_from_db.png')
+    plt.show()
+
+    # 3. Most Common Words in Positive Reviews (Drivers)
+    plt.figure(figsize=(12, 7))
+    sns.barplot(data=positive_words_df, x='count', y='word', palette='Greens_r')
+    plt.title('Most Common Words in Positive Reviews (Drivers)')
+    plt.xlabel('Frequency')
+    plt.ylabel('Words')
+    plt.tight_layout()
+    plt.savefig('positive_words_barchart_from_db.png')
+    plt.show()
+
+    # 4. Most Common Words in Negative Reviews (Pain Points)
+    plt.figure(figsize=(12, 7))
+    sns.barplot(data=negative_words_df, x='count', y='word', palette='Reds_r')
+    plt.title('Most Common Words in Negative Reviews (Pain Points)')
+    plt.xlabel('Frequency')
+    plt.ylabel('Words')
+    plt.tight_layout()
+    plt.savefig('negative_words_barchart_from_db.png')
+    plt.show()
+
+    print("\nAnalysis complete. All visualizations have been saved with the '_from_db' suffix.")
+
+
+if __name__ == "__main__":
+    main()
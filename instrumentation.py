@@ -0,0 +1,283 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+import psutil
+
+# --- Configuration (environment variables) ---
+# PIPELINE_METRICS_FILE: where JSON lines are written ("-" for stderr, "off" to disable)
+# PIPELINE_RUN_ID:       shared id so the five scripts of one nightly run can be joined
+# PIPELINE_PROFILE:      "all", or a comma-separated list of span names to sample-profile
+METRICS_FILE = os.environ.get("PIPELINE_METRICS_FILE", "./data/pipeline_metrics.jsonl")
+RUN_ID = os.environ.get("PIPELINE_RUN_ID", datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S"))
+PROFILE = {name.strip() for name in os.environ.get("PIPELINE_PROFILE", "").split(",") if name.strip()}
+SCRIPT = os.path.splitext(os.path.basename(sys.argv[0] or "interactive"))[0]
+
+_PROCESS = psutil.Process()
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+class PeakRSS:
+    """Samples the process RSS on a background thread and keeps the peak."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.start_rss = 0
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = self.peak_rss = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+
+
+class StackRSSSampler:
+    """
+    One RSS sampler per top-level span.
+
+    Each sample raises the peak of every span currently open on the stack, so
+    nested spans get their own peak without starting threads of their own.
+    """
+
+    def __init__(self, stack: list, interval: float = 0.01):
+        self.stack = stack
+        self.interval = interval
+        self.process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            rss = self.process.memory_info().rss
+            for open_span in list(self.stack):
+                open_span.peak_rss = max(open_span.peak_rss, rss)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class SamplingProfiler:
+    """
+    Samples the calling thread's stack on a background thread.
+
+    Reports, per function, the share of samples in which it was on the stack
+    (inclusive time), which is enough to see where a slow span spends its time.
+    """
+
+    def __init__(self, interval: float = 0.005, top_n: int = 15):
+        self.interval = interval
+        self.top_n = top_n
+        self.samples = 0
+        self.counts = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            seen = set()
+            while frame is not None:
+                code = frame.f_code
+                seen.add(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.counts.update(seen)
+            self.samples += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def top(self) -> list:
+        return [
+            {"function": name, "samples": count, "share": round(count / self.samples, 3)}
+            for name, count in self.counts.most_common(self.top_n)
+        ] if self.samples else []
+
+
+class Span:
+    def __init__(self, name: str, parent=None, rows=None, **fields):
+        self.name = name
+        self.parent = parent
+        self.path = f"{parent.path}/{name}" if parent else name
+        self.rows = rows
+        self.fields = fields
+        self.counters = Counter()
+        self.start_rss = self.peak_rss = 0
+
+    def count(self, counter: str, n: int = 1):
+        self.counters[counter] += n
+
+    def add_time(self, field: str, seconds: float):
+        #Accumulating time for sub-steps that run too often to get a span each (e.g. per batch)
+        self.fields[field] = self.fields.get(field, 0.0) + seconds
+
+
+def _stack() -> list:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def current_span():
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def count(counter: str, n: int = 1):
+    #Adding to a counter (e.g. db_round_trips) on the innermost open span
+    current = current_span()
+    if current is not None:
+        current.count(counter, n)
+
+
+def emit(record: dict):
+    if METRICS_FILE == "off":
+        return
+    line = json.dumps(record, default=str)
+    with _write_lock:
+        if METRICS_FILE == "-":
+            print(line, file=sys.stderr)
+            return
+        os.makedirs(os.path.dirname(METRICS_FILE) or ".", exist_ok=True)
+        with open(METRICS_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+@contextmanager
+def span(name: str, rows=None, profile: bool = False, **fields):
+    """
+    Times a stage or sub-step and writes one JSON line when it ends.
+
+    The record has wall and CPU time, peak RSS, rows and rows/sec, any counters
+    added inside the span (children's counters roll up into their parent), and,
+    when the span is opted in through PIPELINE_PROFILE, the sampled hot functions.
+
+    Only top-level spans start an RSS sampling thread; nested spans read RSS at
+    entry and exit and take their peak from the parent's sampler.
+    """
+    stack = _stack()
+    current = Span(name, parent=stack[-1] if stack else None, rows=rows, **fields)
+    if METRICS_FILE == "off":
+        # Nothing would be written, so skip the timers and samplers too
+        yield current
+        return
+
+    current.start_rss = current.peak_rss = _PROCESS.memory_info().rss
+    rss_sampler = StackRSSSampler(stack) if current.parent is None else nullcontext()
+    profiler = SamplingProfiler() if profile and ("all" in PROFILE or name in PROFILE) else nullcontext()
+    stack.append(current)
+    error = None
+    started_at = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        with rss_sampler, profiler:
+            yield current
+    except Exception as e:
+        error = repr(e)
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        stack.pop()
+        current.peak_rss = max(current.peak_rss, _PROCESS.memory_info().rss)
+        if current.parent is not None:
+            current.parent.counters.update(current.counters)
+            current.parent.peak_rss = max(current.parent.peak_rss, current.peak_rss)
+
+        record = {
+            "ts": started_at,
+            "run_id": RUN_ID,
+            "script": SCRIPT,
+            "span": current.path,
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "peak_rss_mb": round(current.peak_rss / 1024 ** 2, 1),
+            "rss_delta_mb": round((current.peak_rss - current.start_rss) / 1024 ** 2, 1),
+            "rows": current.rows,
+            "rows_per_sec": round(current.rows / wall, 1) if current.rows and wall > 0 else None,
+            **{k: round(v, 4) if isinstance(v, float) else v for k, v in current.fields.items()},
+            **current.counters,
+        }
+        if isinstance(profiler, SamplingProfiler):
+            record["profile"] = profiler.top()
+        if error:
+            record["error"] = error
+        emit(record)
+
+
+def _row_count(obj):
+    #Only DataFrames, Series, arrays and lists count as rows (not paths, cursors or tokenizers)
+    if isinstance(obj, list) or hasattr(obj, "shape"):
+        return len(obj)
+    return None
+
+
+def traced(name: str = None, profile: bool = False):
+    """
+    Decorator that runs a function inside a span.
+
+    Rows are taken from the first sized positional argument (a DataFrame, Series
+    or list), or from the return value for loaders that take a path.
+    Pass profile=True to mark a hot function as eligible for PIPELINE_PROFILE.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows = next((n for n in map(_row_count, args) if n is not None), None)
+            with span(name or func.__name__, rows=rows, profile=profile) as current:
+                result = func(*args, **kwargs)
+                if current.rows is None:
+                    current.rows = _row_count(result)
+                return result
+        return wrapper
+    return decorator
+
+
+class CountingCursor:
+    """Wraps a DB cursor and counts each execute() as a round trip on the open span."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, *args, **kwargs):
+        count("db_round_trips")
+        return self._cursor.execute(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, attr):
+        return getattr(self._cursor, attr)
@@ -0,0 +1,80 @@
+import sys
+import pandas as pd
+
+# Shared dtypes for the review record used by every stage of the pipeline.
+# Low-cardinality fields are categoricals, free text is Arrow-backed and
+# numbers use the narrowest type that holds them (nullable Int8 for ratings, so a
+# missing rating becomes <NA> instead of failing the cast).
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+DATE_FORMAT = "%Y-%m-%d"
+
+REVIEW_DTYPES = {
+    'bank name': 'category',
+    'source': 'category',
+    'sentiment_label': 'category',
+    'theme': 'category',
+    'rating': 'Int8',
+    'sentiment_score': 'float32',
+    'review': TEXT_DTYPE,
+    'keywords': TEXT_DTYPE,
+    'review_id': TEXT_DTYPE,
+}
+DATE_COLUMNS = ['date']
+
+# Same record as read back from the Oracle reviews table
+DB_REVIEW_DTYPES = {
+    'REVIEW_TEXT': TEXT_DTYPE,
+    'RATING': 'Int8',
+    'SENTIMENT_LABEL': 'category',
+}
+
+
+def read_reviews_csv(file_path: str) -> pd.DataFrame:
+    #Reading a review CSV straight into the compact schema
+    columns = pd.read_csv(file_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in REVIEW_DTYPES.items() if col in columns}
+    dates = [col for col in DATE_COLUMNS if col in columns]
+    df = pd.read_csv(file_path, dtype=dtypes, parse_dates=dates, date_format=DATE_FORMAT)
+    # read_csv leaves the whole column as strings if any value misses DATE_FORMAT
+    return apply_review_schema(df)
+
+
+def apply_review_schema(df: pd.DataFrame, dtypes: dict = REVIEW_DTYPES) -> pd.DataFrame:
+    #Casting whichever schema columns are present (e.g. after a stage adds new ones)
+    present = {col: dtype for col, dtype in dtypes.items() if col in df.columns}
+    df = df.astype(present)
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            # Values with a time part still parse; anything unparseable becomes NaT (bound as NULL)
+            df[col] = pd.to_datetime(df[col], format='mixed', errors='coerce')
+    return df
+
+
+def write_reviews_csv(df: pd.DataFrame, file_path: str):
+    #Saving with dates written back as YYYY-MM-DD
+    df.to_csv(file_path, index=False, date_format=DATE_FORMAT)
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def compare_memory(file_path: str) -> pd.DataFrame:
+    #Per-column memory of a bare pd.read_csv against the typed schema
+    raw = pd.read_csv(file_path)
+    typed = read_reviews_csv(file_path)
+    report = pd.DataFrame({
+        'raw_dtype': raw.dtypes.astype(str),
+        'raw_mb': raw.memory_usage(deep=True, index=False) / 1024 ** 2,
+        'typed_dtype': typed.dtypes.astype(str),
+        'typed_mb': typed.memory_usage(deep=True, index=False) / 1024 ** 2,
+    })
+    report.loc['TOTAL', ['raw_mb', 'typed_mb']] = [memory_usage_mb(raw), memory_usage_mb(typed)]
+    return report.round(3)
+
+
+if __name__ == "__main__":
+    # python review_schema.py ./data/bank_reviews_with_sentiment_and_themes.csv
+    for path in sys.argv[1:] or ["./data/bank_reviews_cleaned.csv"]:
+        print(f"📏 Memory usage for {path}")
+        print(compare_memory(path))
@@ -1,39 +1,47 @@
 import os
+import sys
 import pandas as pd
 import re
 from datetime import datetime
 from langdetect import detect, DetectorFactory
 from langdetect.lang_detect_exception import LangDetectException
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from review_schema import TEXT_DTYPE, read_reviews_csv, write_reviews_csv, memory_usage_mb
+from instrumentation import span, traced
+
 # Make detection consistent
 DetectorFactory.seed = 42
 
+@traced()
 def load_reviews(file_path: str) -> pd.DataFrame:
     #Loading the scraped CSV file into a DataFrame
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"❌ File not found: {file_path}")
     try:
-        df = pd.read_csv(file_path)
-        print(f"📄 Loaded {len(df)} rows from: {file_path}")
+        df = read_reviews_csv(file_path)
+        print(f"📄 Loaded {len(df)} rows from: {file_path} ({memory_usage_mb(df):.2f} MB)")
         return df
     except Exception as e:
         raise RuntimeError(f"❌ Failed to load CSV: {e}")
 
 
+@traced()
 def normalize_dates(df: pd.DataFrame) -> pd.DataFrame:
-    #Ensuring all dates are in YYYY-MM-DD format
+    #Ensuring all dates are real datetimes at day precision (saved as YYYY-MM-DD)
     try:
-        df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.strftime('%Y-%m-%d')
+        df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.normalize()
     except Exception as e:
         raise ValueError(f"❌ Date normalization failed: {e}")
     return df
 
 
+@traced()
 def clean_reviews(df: pd.DataFrame) -> pd.DataFrame:
     #Removing missing reviews, emojis, and excessive punctuation/whitespace
     # Drop missing or blank reviews
     df = df.dropna(subset=['review'])
-    df['review'] = df['review'].astype(str).str.strip()
+    df['review'] = df['review'].astype(TEXT_DTYPE).str.strip()
     df = df[df['review'].str.len() > 0]
 
     # Remove emojis
@@ -47,7 +55,7 @@ def clean_reviews(df: pd.DataFrame) -> pd.DataFrame:
         "\U000024C2-\U0001F251"
         "]+", flags=re.UNICODE
     )
-    df['review'] = df['review'].apply(lambda x: emoji_pattern.sub('', x))
+    df['review'] = df['review'].str.replace(emoji_pattern, '', regex=True)
 
     # Normalize whitespace
     df['review'] = df['review'].str.replace(r'\s+', ' ', regex=True).str.strip()
@@ -55,15 +63,17 @@ def clean_reviews(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@traced()
 def save_cleaned_data(df: pd.DataFrame, output_path: str):
     #Saving the cleaned DataFrame to CSV
     try:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        df.to_csv(output_path, index=False)
+        write_reviews_csv(df, output_path)
         print(f"✅ Cleaned data saved to: {output_path} ({len(df)} rows)")
     except Exception as e:
         raise RuntimeError(f"❌ Failed to save cleaned data: {e}")
 
+@traced(profile=True)
 def remove_non_english_reviews(df: pd.DataFrame) -> pd.DataFrame:
     #Removing  reviews not detected as English (lang='en')
     def is_english(text):
@@ -81,11 +91,12 @@ def remove_non_english_reviews(df: pd.DataFrame) -> pd.DataFrame:
 def preprocess_reviews(input_path: str, output_path: str):
     #Full preprocessing pipeline
     try:
-        df = load_reviews(input_path)
-        df = normalize_dates(df)
-        df = clean_reviews(df)
-        df = remove_non_english_reviews(df)
-        save_cleaned_data(df, output_path)
+        with span("preprocess_reviews"):
+            df = load_reviews(input_path)
+            df = normalize_dates(df)
+            df = clean_reviews(df)
+            df = remove_non_english_reviews(df)
+            save_cleaned_data(df, output_path)
     except Exception as e:
         print(e)
 
@@ -3,8 +3,13 @@
 from google_play_scraper import reviews,Sort
 import pandas as pd
 import os
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from review_schema import read_reviews_csv, write_reviews_csv, apply_review_schema
+from instrumentation import traced
+
 # --- Bank configurations ---
 BANKS = [
     {
@@ -26,12 +31,14 @@ SOURCE = 'Google Play'
 REVIEWS_PER_BANK = 4000  # Or more if needed
 
 
+@traced()
 def load_existing_reviews(filepath):
     if os.path.exists(filepath):
-        return pd.read_csv(filepath)
-    return pd.DataFrame(columns=['date', 'bank name', 'review', 'rating', 'source'])
+        return read_reviews_csv(filepath)
+    return apply_review_schema(pd.DataFrame(columns=['date', 'bank name', 'review', 'rating', 'source']))
 
 
+@traced()
 def fetch_reviews(app_id, bank_name):
     result, _ = reviews(
         app_id,
@@ -53,17 +60,20 @@ def fetch_reviews(app_id, bank_name):
     ]
 
 
+@traced()
 def update_combined_csv(new_data, existing_df, csv_file):
-    new_df = pd.DataFrame(new_data)
-    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
+    new_df = apply_review_schema(pd.DataFrame(new_data))
+    # Categories differ between the two frames, so re-apply the schema after concat
+    combined_df = apply_review_schema(pd.concat([existing_df, new_df], ignore_index=True))
     combined_df.drop_duplicates(subset=['date', 'bank name', 'review'], inplace=True)
     
     os.makedirs(os.path.dirname(csv_file), exist_ok=True)
 
-    combined_df.to_csv(csv_file, index=False)
+    write_reviews_csv(combined_df, csv_file)
     return len(new_df), len(combined_df)
 
 
+@traced("scraper")
 def scrape_all_banks():
     print(f"\n📥 Loading existing reviews from: {CSV_FILENAME}")
     existing_df = load_existing_reviews(CSV_FILENAME)
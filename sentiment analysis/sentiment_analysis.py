@@ -1,9 +1,16 @@
+import os
+import sys
+import time
 import pandas as pd
 import torch
 import numpy as np
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from scipy.special import softmax
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from review_schema import read_reviews_csv, write_reviews_csv, apply_review_schema, memory_usage_mb
+from instrumentation import current_span, traced
+
 # --- Configuration ---
 INPUT_FILE = "./data/bank_reviews_cleaned.csv"
 OUTPUT_FILE = "./data/bank_reviews_with_sentiment.csv"
@@ -12,15 +19,17 @@ DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 THRESHOLD = 0.4  # Neutral if confidence < this value from both ends
 
 
+@traced()
 def load_data(file_path: str) -> pd.DataFrame:
     try:
-        df = pd.read_csv(file_path)
-        print(f"📄 Loaded {len(df)} reviews")
+        df = read_reviews_csv(file_path)
+        print(f"📄 Loaded {len(df)} reviews ({memory_usage_mb(df):.2f} MB)")
         return df
     except Exception as e:
         raise RuntimeError(f"Failed to read file: {e}")
 
 
+@traced()
 def load_model():
     tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
     model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
@@ -28,18 +37,28 @@ def load_model():
     return tokenizer, model
 
 
+@traced(profile=True)
 def predict_sentiment_batch(texts, tokenizer, model, batch_size=32):
     sentiments = []
     scores = []
 
+    # Per-batch steps are accumulated on the span rather than emitted one line per batch
+    stage = current_span()
     model.eval()
     with torch.no_grad():
         for i in range(0, len(texts), batch_size):
             batch_texts = texts[i:i + batch_size]
+            t0 = time.perf_counter()
             inputs = tokenizer(batch_texts, return_tensors="pt", padding=True, truncation=True, max_length=512).to(DEVICE)
+            t1 = time.perf_counter()
             outputs = model(**inputs)
             logits = outputs.logits.detach().cpu().numpy()
             probs = softmax(logits, axis=1)
+            t2 = time.perf_counter()
+            if stage is not None:
+                stage.add_time('tokenize_s', t1 - t0)
+                stage.add_time('inference_s', t2 - t1)
+                stage.count('batches')
 
             for prob in probs:
                 score = prob[1]  # Positive class confidence
@@ -56,20 +75,23 @@ def predict_sentiment_batch(texts, tokenizer, model, batch_size=32):
     return sentiments, scores
 
 
+@traced()
 def add_sentiment(df: pd.DataFrame, tokenizer, model):
     print("🔍 Predicting sentiment using DistilBERT...")
     texts = df['review'].astype(str).tolist()
     sentiments, scores = predict_sentiment_batch(texts, tokenizer, model)
     df['sentiment_label'] = sentiments
     df['sentiment_score'] = scores
-    return df
+    return apply_review_schema(df)
 
 
+@traced()
 def save_output(df: pd.DataFrame, path: str):
-    df.to_csv(path, index=False)
+    write_reviews_csv(df, path)
     print(f"✅ Output saved to: {path}")
 
 
+@traced("sentiment_analysis")
 def main():
     df = load_data(INPUT_FILE)
 